@@ -1,5 +1,6 @@
 import os
 import json
+import bisect
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 import datetime
@@ -9,32 +10,62 @@ import logging
 from pathlib import Path
 import unicodedata
 import difflib
+import functools
+import heapq
 import pathlib
 
+try:
+    import orjson
+except ImportError:  # orjson kurulu değilse standart json kullanılır
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process as rf_process
+except ImportError:  # rapidfuzz kurulu değilse difflib ile devam edilir
+    fuzz = rf_process = None
 # --- Configuration / Sabitler ---
 CUSTOMER_FILE = Path("customers.json")
+PRETTY_CUSTOMER_FILE = False  # True: customers.json girintili (elle okumak için) yazılır
 LOG_FILE = Path("uygulama.log")
+WRITE_BUFFER_SIZE = 1 << 16
+LISTBOX_PAGE_SIZE = 100  # müşteri listesine tek seferde eklenen satır sayısı
+FUZZY_CUTOFF_LOOKUP = 0.83  # fişteki isim için tek müşteri eşleşmesi
+FUZZY_CUTOFF_FILTER = 0.7   # yazarken liste filtreleme
 logging.basicConfig(filename=str(LOG_FILE), level=logging.ERROR,
                     format="%(asctime)s [%(levelname)s] %(message)s", encoding='utf-8')
 
 # --- Veri modeli ---
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Customer:
     name: str
     phone: str = ''
     address: str = ''
+    _norm: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, attr, value):
+        # İsim değişince önbelleğe alınmış normalize anahtarı geçersiz kılınır
+        if attr == 'name':
+            object.__setattr__(self, '_norm', None)
+        object.__setattr__(self, attr, value)
+
+    @property
+    def norm(self) -> str:
+        """Return the normalized name, computing it once per name change."""
+        if self._norm is None:
+            self._norm = _normalize_for_comparison(self.name)
+        return self._norm
 
     def to_dict(self) -> dict:
-      """Return a dictionary representation of the customer."""
+        """Return a dictionary representation of the customer."""
         return {'name': self.name, 'phone': self.phone, 'address': self.address}
 
     @classmethod
     def from_dict(cls, data: dict) -> "Customer":
-      """Create a Customer instance from a dictionary."""
+        """Create a Customer instance from a dictionary."""
         return cls(
             name=data.get('name', ''),
             phone=data.get('phone', ''),
@@ -42,58 +73,111 @@ class Customer:
         )
 
 
-
+@functools.lru_cache(maxsize=4096)
 def _normalize_for_comparison(name: str) -> str:
-  """Normalize a name for case-insensitive comparisons."""
+    """Normalize a name for case-insensitive comparisons."""
+    # ASCII is NFKC-invariant and casefolds like lower(): skip the Unicode passes
+    if name.isascii():
+        return " ".join(name.split()).lower()
     # Unicode normalize, strip extra spaces, casefold for comparison (handles Turkish case more robustly)
     name = unicodedata.normalize("NFKC", name)
     name = " ".join(name.strip().split())
     return name.casefold()
 
+_TR_LOWER = str.maketrans("IİĞÜŞÖÇ", "iiğüşöç")
+_TR_TITLE_FIX = str.maketrans("i", "İ")
+
+def _turkish_title(word: str) -> str:
+    """Title-case a single word with Turkish-specific handling."""
+    # Initial i maps to dotted İ via the table; every other letter just upper()s
+    w = word.translate(_TR_LOWER).lower()
+    return w[:1].translate(_TR_TITLE_FIX).upper() + w[1:]
+
+@functools.lru_cache(maxsize=4096)
 def _format_for_display(name: str) -> str:
     """Return a display-friendly title-cased name."""
-    # Title-case with minimal Turkish-specific handling for initial i
-    def turkish_title(word: str) -> str:
-      """Title-case a single word with Turkish-specific handling."""
-        w = word.strip().lower()
-        if w.startswith("i"):
-            return "İ" + w[1:]
-        return w.capitalize()
-    return " ".join(turkish_title(w) for w in name.strip().split())
+    return " ".join(_turkish_title(w) for w in name.split())
+
+
+def _close_matches(query: str, choices: list[str], n: int, cutoff: float, weighted: bool = False) -> list[str]:
+    """Return up to n choices similar to query, best match first."""
+    if rf_process is not None:
+        scorer = fuzz.WRatio if weighted else fuzz.ratio
+        if n == 1:
+            best = rf_process.extractOne(query, choices, scorer=scorer, score_cutoff=cutoff * 100)
+            return [best[0]] if best else []
+        return [m[0] for m in rf_process.extract(query, choices, scorer=scorer, limit=n, score_cutoff=cutoff * 100)]
+    # difflib yedeği: ucuz üst sınırlarla ele, ratio() yalnızca kalanlar için hesaplanır.
+    # Eşik, ilk n aday dolduktan sonra n'inci en iyi skora yükselir.
+    sm = difflib.SequenceMatcher()
+    sm.set_seq2(query)
+    best = []  # (score, choice) min-heap
+    for choice in choices:
+        floor = best[0][0] if len(best) == n else cutoff
+        sm.set_seq1(choice)
+        if sm.real_quick_ratio() < floor or sm.quick_ratio() < floor:
+            continue
+        score = sm.ratio()
+        if score < floor:
+            continue
+        if len(best) < n:
+            heapq.heappush(best, (score, choice))
+        elif (score, choice) > best[0]:
+            heapq.heapreplace(best, (score, choice))
+    return [choice for _, choice in heapq.nlargest(n, best)]
 
 
 def _find_customer_by_name(customers, name: str):
-   """Search for a customer by name using normalized and fuzzy matching."""
+    """Search for a customer by name using normalized and fuzzy matching."""
     if not name:
         return None
     key = _normalize_for_comparison(name)
     for c in customers:
-        if _normalize_for_comparison(c.name) == key:
+        if c.norm == key:
             return c
-    candidates = { _normalize_for_comparison(c.name): c for c in customers }
-    close = difflib.get_close_matches(key, list(candidates.keys()), n=1, cutoff=0.7)
+    # Tam eşleşme yoksa bulanık eşleşmeye geçilir. Önek/alt dize eşleşmesi yalnızca
+    # liste filtresinde kullanılır; fişe yanlış müşteri adı yazılmasın.
+    candidates = {c.norm: c for c in customers}
+    norm_names = list(candidates)
+    close = _close_matches(key, norm_names, n=1, cutoff=FUZZY_CUTOFF_LOOKUP)
     if close:
         return candidates[close[0]]
     return None
 
 
 def load_customers() -> list[Customer]:
-  """Load customers from disk, returning a list of Customer objects."""
+    """Load customers from disk, returning a list of Customer objects."""
     if CUSTOMER_FILE.exists():
         try:
-            with CUSTOMER_FILE.open('r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    return [Customer.from_dict(item) for item in data]
+            if orjson is not None:
+                data = orjson.loads(CUSTOMER_FILE.read_bytes())
+            else:
+                with CUSTOMER_FILE.open('r', encoding='utf-8') as f:
+                    data = json.load(f)
+            if isinstance(data, list):
+                return [Customer.from_dict(item) for item in data]
         except Exception:
             logging.exception('load_customers failed')
     return []
 
+def _write_atomic(path: Path, payload: bytes) -> None:
+    """Write payload to a temporary file in one buffered write, then swap it in."""
+    tmp = path.with_suffix('.tmp')
+    with tmp.open('wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(payload)
+    tmp.replace(path)
+
 def save_customers(customers: list[Customer]) -> None:
-  """Persist the list of customers to disk."""
+    """Persist the list of customers to disk."""
+    data = [c.to_dict() for c in customers]
     try:
-        with CUSTOMER_FILE.open('w', encoding='utf-8') as f:
-            json.dump([c.to_dict() for c in customers], f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if PRETTY_CUSTOMER_FILE else 0)
+        elif PRETTY_CUSTOMER_FILE:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        _write_atomic(CUSTOMER_FILE, payload)
     except Exception:
         logging.exception('save_customers failed')
 
@@ -105,7 +189,7 @@ class ReceiptApp:
     }
 
     def __init__(self, master):
-      """Initialize the GUI components and load initial data."""
+        """Initialize the GUI components and load initial data."""
         self.master = master
         master.title('Sebze-Meyve Fiş Uygulaması (Sade)')
 
@@ -113,7 +197,9 @@ class ReceiptApp:
         style.configure('Bold.TLabelframe.Label', font=('Segoe UI', 10, 'bold'), foreground='darkblue')
 
         self.customers = load_customers()
-        save_customers(self.customers)  # ensure file exists and is normalized
+        if not CUSTOMER_FILE.exists():
+            save_customers(self.customers)  # ensure file exists
+        self._rebuild_name_index()
 
         # Variables
         self.customer_name_var = tk.StringVar()
@@ -123,6 +209,7 @@ class ReceiptApp:
         self.price_per_kg_var = tk.StringVar()
         self.total_var = tk.StringVar(value='0.00')
         self.role_var = tk.StringVar(value='Pazarcı Esnafı')
+        self._vat_rate = self.ROLE_VAT_MAP.get(self.role_var.get(), 0.0)
         self.new_customer_var = tk.StringVar()
         self.category_var = tk.StringVar(value='MEYVE')
         self.subitem_var = tk.StringVar()
@@ -143,16 +230,19 @@ class ReceiptApp:
         ttk.Label(customer_frame, text='Müşteri Adı:').grid(row=0, column=0, sticky='e', padx=2, pady=2)
         name_entry = ttk.Entry(customer_frame, textvariable=self.customer_name_var, width=25)
         name_entry.grid(row=0, column=1, sticky='ew', padx=2, pady=2)
+        self._filter_after_id = None
         name_entry.bind('<KeyRelease>', self._on_name_typing)
 
         ttk.Label(customer_frame, text='Müşteri Listesi:').grid(row=1, column=0, sticky='ne', padx=2, pady=4)
-        self.listbox = tk.Listbox(customer_frame, height=6, activestyle='dotbox')
+        self.listbox = ttk.Treeview(customer_frame, show='tree', height=6, selectmode='browse')
         self.listbox_scrollbar = ttk.Scrollbar(customer_frame, orient='vertical', command=self.listbox.yview)
-        self.listbox.configure(yscrollcommand=self.listbox_scrollbar.set)
+        self.listbox.configure(yscrollcommand=self._on_listbox_scrolled)
         self.listbox.grid(row=1, column=1, sticky='nsew', padx=(2, 0), pady=4)
         self.listbox_scrollbar.grid(row=1, column=2, sticky='ns', padx=(0, 2), pady=4)
+        self._listbox_names = ()
+        self._listbox_loaded = 0
         self._refresh_listbox()
-        self.listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
+        self.listbox.bind('<<TreeviewSelect>>', self._on_listbox_select)
         self.listbox.bind('<MouseWheel>', self._on_mousewheel)
         self.listbox.bind('<Button-4>', self._on_mousewheel)
         self.listbox.bind('<Button-5>', self._on_mousewheel)
@@ -190,7 +280,7 @@ class ReceiptApp:
         self.role_selector = ttk.Combobox(role_frame, textvariable=self.role_var, state='readonly',
                                           values=list(self.ROLE_VAT_MAP.keys()), width=20)
         self.role_selector.grid(row=0, column=1, sticky='w', padx=2, pady=2)
-        self.role_selector.bind('<<ComboboxSelected>>', lambda e: self.calculate_total())
+        self.role_selector.bind('<<ComboboxSelected>>', self._on_role_changed)
 
         # MAIN FORM
         form_wrapper = ttk.Frame(master)
@@ -205,8 +295,10 @@ class ReceiptApp:
         ttk.Label(form_wrapper, text='Toplam Tutar (KDV dahil):').grid(row=3, column=0, sticky='e', padx=5, pady=6)
         tk.Entry(form_wrapper, textvariable=self.total_var, width=20, state='readonly', foreground='blue').grid(row=3, column=1, sticky='w', padx=5, pady=6)
 
+        self._total_after_id = None
+        self._last_total_key = None
         for var in (self.weight_var, self.price_per_kg_var, self.role_var):
-            var.trace_add('write', lambda *args: self.calculate_total())
+            var.trace_add('write', self._schedule_total_recalc)
 
         # Bottom actions
         action_frame = ttk.Frame(master, padding=6)
@@ -217,17 +309,51 @@ class ReceiptApp:
         # Initial values
         self._on_category_changed()
 
+    def _rebuild_name_index(self):
+        """Rebuild the parallel normalized/display name lists, sorted by normalized key."""
+        pairs = sorted((c.norm, c.name) for c in self.customers)
+        self._norm_names = [n for n, _ in pairs]
+        self._display_names = [d for _, d in pairs]
+        self._name_key_set = set(self._norm_names)
+
+    def _set_listbox_items(self, names):
+        """Replace the listbox contents if they changed, loading only the first page."""
+        names = tuple(names)
+        if names == self._listbox_names:
+            return
+        self._listbox_names = names
+        self._listbox_loaded = 0
+        self.listbox.delete(*self.listbox.get_children())
+        self._load_more_listbox_rows()
+
+    def _load_more_listbox_rows(self):
+        """Append the next page of names to the listbox."""
+        end = min(self._listbox_loaded + LISTBOX_PAGE_SIZE, len(self._listbox_names))
+        for name in self._listbox_names[self._listbox_loaded:end]:
+            self.listbox.insert('', 'end', text=name)
+        self._listbox_loaded = end
+
+    def _on_listbox_scrolled(self, first, last):
+        """Update the scrollbar and load more rows once the end is reached."""
+        self.listbox_scrollbar.set(first, last)
+        if float(last) >= 1.0 and self._listbox_loaded < len(self._listbox_names):
+            self._load_more_listbox_rows()
+
+    def _selected_listbox_name(self):
+        """Return the name of the selected customer row, or None."""
+        sel = self.listbox.selection()
+        if sel:
+            return self.listbox.item(sel[0], 'text')
+        return None
+
     def _refresh_listbox(self):
-       """Populate the listbox with customers sorted alphabetically."""
-        self.listbox.delete(0, tk.END)
-        for c in sorted(self.customers, key=lambda c: c.name.lower()):
-            self.listbox.insert(tk.END, c.name)
+        """Populate the listbox with customers sorted alphabetically."""
+        self._set_listbox_items(self._display_names)
 
     def _on_listbox_select(self, event):
-          """Insert the selected customer name into the entry field."""
-        sel = self.listbox.curselection()
-        if sel:
-            name = self.listbox.get(sel[0])
+        """Insert the selected customer name into the entry field."""
+        name = self._selected_listbox_name()
+        if name:
             self.customer_name_var.set(name)
 
     def _add_new_customer(self):
@@ -237,53 +363,66 @@ class ReceiptApp:
         if not normalized:
             messagebox.showinfo('Bilgi', 'Müşteri adı boş olamaz.')
             return
-        existing_keys = [_normalize_for_comparison(c.name) for c in self.customers]
-        if normalized in existing_keys:
+        if normalized in self._name_key_set:
             messagebox.showinfo('Bilgi', 'Bu müşteri zaten mevcut.')
             return
         display_name = _format_for_display(raw)
-        self.customers.append(Customer(name=display_name))
+        customer = Customer(name=display_name)
+        self.customers.append(customer)
+        i = bisect.bisect_right(self._norm_names, customer.norm)
+        self._norm_names.insert(i, customer.norm)
+        self._display_names.insert(i, display_name)
+        self._name_key_set.add(customer.norm)
         save_customers(self.customers)
         self.new_customer_var.set('')
         self._refresh_listbox()
 
     def _remove_selected_customer(self):
-       """Delete the selected customer after confirmation."""
-        sel = self.listbox.curselection()
-        if not sel:
+        """Delete the selected customer after confirmation."""
+        name = self._selected_listbox_name()
+        if not name:
             messagebox.showinfo('Uyarı', 'Silmek için bir müşteri seçin.')
             return
-        name = self.listbox.get(sel[0])
         if messagebox.askyesno('Sil', f"'{name}' müşterisini silmek istiyor musunuz?"):
-            self.customers = [c for c in self.customers if _normalize_for_comparison(c.name) != _normalize_for_comparison(name)]
+            key = _normalize_for_comparison(name)
+            self.customers = [c for c in self.customers if c.norm != key]
+            lo = bisect.bisect_left(self._norm_names, key)
+            hi = bisect.bisect_right(self._norm_names, key, lo=lo)
+            del self._norm_names[lo:hi]
+            del self._display_names[lo:hi]
+            self._name_key_set.discard(key)
             save_customers(self.customers)
             self._refresh_listbox()
             if self.customer_name_var.get() == name:
                 self.customer_name_var.set('')
 
     def _on_name_typing(self, event):
+        """Schedule a filter pass, coalescing rapid keystrokes into one."""
+        if self._filter_after_id:
+            self.master.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.master.after(120, self._apply_filter)
+
+    def _apply_filter(self):
         """Filter the customer list based on typed characters."""
+        self._filter_after_id = None
         typed_raw = self.customer_name_var.get()
-        norm_typed = _normalize_for_comparison(typed_raw)
-        matches = set()
-        # substring match (normalized)
-        for c in self.customers:
-            if norm_typed and norm_typed in _normalize_for_comparison(c.name):
-                matches.add(c.name)
-        # fuzzy close matches
-        normalized_map = { _normalize_for_comparison(c.name): c.name for c in self.customers }
-        if norm_typed:
-            close = difflib.get_close_matches(norm_typed, list(normalized_map.keys()), n=10, cutoff=0.6)
-            for key in close:
-                matches.add(normalized_map[key])
-        self.listbox.delete(0, tk.END)
-        for name in sorted(matches, key=lambda x: x.lower()):
-            self.listbox.insert(tk.END, name)
         if not typed_raw:
             self._refresh_listbox()
+            return
+        norm_typed = _normalize_for_comparison(typed_raw)
+        matches = []
+        if norm_typed:
+            # fuzzy close matches, as positions in the sorted index
+            close = _close_matches(norm_typed, self._norm_names, n=10, cutoff=FUZZY_CUTOFF_FILTER, weighted=True)
+            fuzzy_hits = {bisect.bisect_left(self._norm_names, key) for key in close}
+            # substring match (normalized); the index is already sorted, so no re-sort is needed
+            for i, (norm, display) in enumerate(zip(self._norm_names, self._display_names)):
+                if norm_typed in norm or i in fuzzy_hits:
+                    matches.append(display)
+        self._set_listbox_items(matches)
 
     def _on_mousewheel(self, event):
-         """Scroll the listbox using mouse wheel events."""
+        """Scroll the listbox using mouse wheel events."""
         try:
             if event.delta:
                 direction = -1 if event.delta > 0 else 1
@@ -295,7 +434,7 @@ class ReceiptApp:
                 self.listbox.yview_scroll(1, 'units')
 
     def _on_category_changed(self, event=None):
-         """Adjust subitem options when the category selection changes."""
+        """Adjust subitem options when the category selection changes."""
         cat = self.category_var.get()
         if cat == 'MEYVE':
             self.subitem_combobox.configure(values=self.fruits, state='readonly')
@@ -306,11 +445,11 @@ class ReceiptApp:
         self._apply_subitem_to_item()
 
     def _on_subitem_selected(self, event=None):
-      """Handle selection of a predefined subitem."""
+        """Handle selection of a predefined subitem."""
         self._apply_subitem_to_item()
 
     def _apply_subitem_to_item(self):
-              """Update the item type based on current subitem value."""
+        """Update the item type based on current subitem value."""
         val = self.subitem_var.get()
         if val == 'DİĞER':
             custom = simpledialog.askstring('Diğer Alt Cinsi', 'Alt cinsi giriniz:')
@@ -321,7 +460,7 @@ class ReceiptApp:
 
     
     def _parse_number(self, value: str) -> float:
-      """Convert a localized string to a float value."""
+        """Convert a localized string to a float value."""
         if not value:
             return 0.0
         try:
@@ -329,26 +468,40 @@ class ReceiptApp:
         except ValueError:
             return 0.0
 
+    def _on_role_changed(self, event=None):
+        """Cache the VAT rate for the newly selected role and update the total."""
+        self._vat_rate = self.ROLE_VAT_MAP.get(self.role_var.get(), 0.0)
+        self.calculate_total()
+
+    def _schedule_total_recalc(self, *args):
+        """Coalesce input changes into a single total recalculation."""
+        if self._total_after_id:
+            self.master.after_cancel(self._total_after_id)
+        self._total_after_id = self.master.after(50, self.calculate_total)
+
     def calculate_total(self) -> None:
-         """Recalculate the total price including VAT."""
+        """Recalculate the total price including VAT."""
+        key = (self.weight_var.get(), self.price_per_kg_var.get(), self._vat_rate)
+        if key == self._last_total_key:
+            return
+        self._last_total_key = key
         try:
-            weight = self._parse_number(self.weight_var.get())
-            price = self._parse_number(self.price_per_kg_var.get())
+            weight = self._parse_number(key[0])
+            price = self._parse_number(key[1])
             net_total = weight * price
-            vat_rate = self.ROLE_VAT_MAP.get(self.role_var.get(), 0.0)
-            total_with_vat = net_total + net_total * vat_rate
+            total_with_vat = net_total + net_total * self._vat_rate
             self.total_var.set(f"{total_with_vat:.2f}".replace('.', ',') + ' TL')
         except Exception:
             logging.exception('calculate_total failed')
 
-    def _generate_receipt_text(self, customer, item_type, piece_count, weight, price, vat_rate):
-      """Create the plain text content of the receipt."""
+    def _generate_receipt_text(self, customer, item_type, piece_count, weight, price, vat_rate, now):
+        """Create the plain text content of the receipt."""
         net_total = weight * price
         vat_amount = net_total * vat_rate
         total_with_vat = net_total + vat_amount
         return (
             '=== SEBZE-MEYVE FİŞİ ===\n'
-            f"Tarih: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Tarih: {now:%Y-%m-%d %H:%M:%S}\n"
             f"Müşteri Türü: {self.role_var.get()}\n"
             f"Müşteri Adı: {customer.name if customer else ''}\n"
             f"Malın Cinsi: {item_type}\n"
@@ -361,7 +514,7 @@ class ReceiptApp:
         )
 
     def _print_to_printer(self, file_path):
-      """Send the file to the system print queue."""
+        """Send the file to the system print queue."""
         printed = False
         if platform.system() == 'Windows':
             try:
@@ -378,7 +531,7 @@ class ReceiptApp:
         return printed
 
     def clear_form(self):
-       """Reset all form fields to their defaults."""
+        """Reset all form fields to their defaults."""
         self.customer_name_var.set('')
         self.item_type_var.set('')
         self.piece_count_var.set('')
@@ -396,17 +549,16 @@ class ReceiptApp:
 
     
     def _write_receipt_atomic(self, path: Path, content: str) -> None:
-      """Atomically write receipt content to a file."""
-        tmp = path.with_suffix('.tmp')
+        """Atomically write receipt content to a file."""
         try:
-            tmp.write_text(content, encoding='utf-8')
-            tmp.replace(path)
+            # Metin kipindeki satır sonu dönüşümü korunur (Windows'ta CRLF)
+            _write_atomic(path, content.replace('\n', os.linesep).encode('utf-8'))
         except Exception:
             logging.exception("Atomic write of receipt failed")
             raise
 
     def _do_print(self, file_path: pathlib.Path):
-      """Print the given file using platform-specific commands."""
+        """Print the given file using platform-specific commands."""
         try:
             if platform.system() == 'Windows':
                 os.startfile(str(file_path), 'print')
@@ -416,7 +568,7 @@ class ReceiptApp:
             logging.exception("Printing failed")
 
     def _clear_form_after_print(self):
-       """Clear specific fields after successful printing."""
+        """Clear specific fields after successful printing."""
         self.piece_count_var.set('')
         self.weight_var.set('')
         self.price_per_kg_var.set('')
@@ -424,7 +576,7 @@ class ReceiptApp:
 
     
     def print_receipt(self):
-         """Validate input, save the receipt, and send it to the printer."""
+        """Validate input, save the receipt, and send it to the printer."""
         try:
             # Kısa vadeli validasyonlar
             customer_name = self.customer_name_var.get().strip()
@@ -444,26 +596,28 @@ class ReceiptApp:
             if customer is None:
                 customer_display = _format_for_display(customer_name)
                 customer = Customer(name=customer_display)
-            vat_rate = self.ROLE_VAT_MAP.get(self.role_var.get(), 0.0)
+            vat_rate = self._vat_rate
+            now = datetime.datetime.now()
             receipt_text = self._generate_receipt_text(
                 customer,
                 self.item_type_var.get(),
                 self.piece_count_var.get(),
                 weight,
                 price,
-                vat_rate
+                vat_rate,
+                now
             )
+            filename = f"fis_{now:%Y%m%d_%H%M%S}.txt"
 
             # Kaydetme yeri: önceki dizin varsa sor, yoksa seçtir
             if hasattr(self, 'last_save_dir') and self.last_save_dir:
                 use_prev = messagebox.askyesno('Kaydetme yeri', f'Önceki konuma kaydetmek istiyor musunuz?\n{self.last_save_dir}')
                 if use_prev:
                     save_dir = Path(self.last_save_dir)
-                    filename = f"fis_{datetime.datetime.now():%Y%m%d_%H%M%S}.txt"
                     save_path = save_dir / filename
                 else:
                     chosen = filedialog.asksaveasfilename(defaultextension='.txt',
-                        initialfile=f"fis_{datetime.datetime.now():%Y%m%d_%H%M%S}.txt",
+                        initialfile=filename,
                         filetypes=[('Text Files', '*.txt')], title='Fişi Kaydet')
                     if not chosen:
                         return
@@ -471,7 +625,7 @@ class ReceiptApp:
                     self.last_save_dir = str(save_path.parent)
             else:
                 chosen = filedialog.asksaveasfilename(defaultextension='.txt',
-                    initialfile=f"fis_{datetime.datetime.now():%Y%m%d_%H%M%S}.txt",
+                    initialfile=filename,
                     filetypes=[('Text Files', '*.txt')], title='Fişi Kaydet')
                 if not chosen:
                     return
@@ -489,7 +643,7 @@ class ReceiptApp:
 
 
 def main():
-     """Start the receipt application."""
+    """Start the receipt application."""
     root = tk.Tk()
     ReceiptApp(root)
     root.mainloop()